@@ -12,24 +12,38 @@
 # также загрузку и сохранение данных в формат XML.
 
 import argparse
-import bisect
+import os
 import sys
-import xml.etree.ElementTree as ET
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass, field
-from io import StringIO
 from pathlib import Path
-from xml.dom import minidom
+from xml.sax.saxutils import quoteattr
 
 from colorama import Fore, Style
 
+# Цвета связываются один раз при импорте, а не для каждой строки дерева
+_FILE_PRE = Fore.GREEN
+_DIR_PRE = Fore.YELLOW
+_LINE_END = Style.RESET_ALL + "\n"
 
-@dataclass
+# Запись каталога: путь, отображаемое имя, признак каталога и результат stat
+_Entry = tuple[str, str, bool, os.stat_result | None]
+
+
+@dataclass(eq=False, slots=True)
 class TreeNode:
-    state: Path
+    state: str
     children: list["TreeNode"] = field(default_factory=list)
+    is_dir: bool = False
+    display_name: str = ""
+
+    def __post_init__(self) -> None:
+        if not self.display_name:
+            self.display_name = os.path.basename(self.state)
 
     def add_child(self, child: "TreeNode") -> None:
-        bisect.insort(self.children, child)
+        self.children.append(child)
 
     def __repr__(self) -> str:
         return f"<{self.state}>"
@@ -43,103 +57,210 @@ class TreeNode:
         return self.state == other.state and self.children == other.children
 
     def __lt__(self, other: "TreeNode") -> bool:
-        return len(self) < len(other)
+        return self.display_name < other.display_name
 
 
 @dataclass
 class Tree:
     directory: Path
     args: argparse.Namespace = field(default_factory=argparse.Namespace)
+    limit: int = 200
+    workers: int | None = None
+    stat_cache: dict[str, os.stat_result] | None = None
     root: TreeNode = field(init=False)
     dir_count: int = field(init=False, default=0)
     file_count: int = field(init=False, default=0)
     full: bool = field(init=False, default=False)
+    _include_hidden: bool = field(init=False, repr=False, default=False)
+    _dirs_only: bool = field(init=False, repr=False, default=False)
+    _show_path: bool = field(init=False, repr=False, default=False)
+    _max_depth: int = field(init=False, repr=False, default=-1)
 
     def __post_init__(self) -> None:
-        self.root = TreeNode(self.directory)
+        # Флаги читаются из Namespace один раз, а не для каждой записи
+        self._include_hidden = bool(self.args.a)
+        self._dirs_only = bool(self.args.d)
+        self._show_path = bool(self.args.f)
+        if self.args.max_depth is not None:
+            self._max_depth = self.args.max_depth
+        self.root = TreeNode(str(self.directory), is_dir=True)
         self.generate_tree(self.root, 0)
 
     def expand(self, node: TreeNode) -> None:
+        if self.full:
+            return
+        self.__add_entries(node, self.__read_dir(node.state))
+
+    def generate_tree(self, node: TreeNode, level: int = 0) -> None:
+        expanded: list[TreeNode] = []
+        # Системные вызовы отпускают GIL, поэтому каталоги читаются параллельно;
+        # на медленных и сетевых файловых системах потоков имеет смысл больше
+        workers = self.workers
+        if workers is None:
+            workers = min(32, (os.cpu_count() or 1) * 4)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # Потоки только читают каталоги, а подсчёт и лимит применяются
+            # здесь в порядке обхода в ширину, поэтому результат не зависит
+            # от того, какой поток закончил первым
+            pending: deque[tuple[TreeNode, int, Future[list[_Entry]]]] = deque()
+
+            def submit(current: TreeNode, depth: int) -> None:
+                if depth != self._max_depth:
+                    expanded.append(current)
+                    future = executor.submit(self.__read_dir, current.state)
+                    pending.append((current, depth, future))
+
+            submit(node, level)
+            while pending and not self.full:
+                current, depth, future = pending.popleft()
+                self.__add_entries(current, future.result())
+                for child in current.children:
+                    if child.is_dir:
+                        submit(child, depth + 1)
+            # Лимит исчерпан: ещё не начатые каталоги не читаем
+            executor.shutdown(cancel_futures=True)
+        # Сортируем один раз после обхода, когда число детей уже известно
+        for current in expanded:
+            current.children.sort(key=lambda child: (len(child), child.display_name))
+
+    def __read_dir(self, path: str) -> list[_Entry]:
+        entries: list[_Entry] = []
+        # Недоступные каталоги пропускаются без исключения
+        if self.full or not os.access(path, os.R_OK | os.X_OK):
+            return entries
+        show_path = self._show_path
+        # Путь записи всегда начинается с пути корня, поэтому относительный
+        # путь получается срезом строки
+        prefix_len = len(os.path.join(self.root.state, ""))
+        # Методы связываются с локальными именами до цикла по записям
+        should_include = self.__should_include
+        add_entry = entries.append
+        with_stat = self.stat_cache is not None
+        limit = self.limit
         try:
-            for child in node.state.iterdir():
-                if not self.__should_include(child):
-                    continue
-                self.__increment_counts(child)
-                if self.full:
-                    break
-                node.add_child(TreeNode(child))
-        except PermissionError:
+            with os.scandir(path) as it:
+                for entry in it:
+                    if not should_include(entry):
+                        continue
+                    entry_path = entry.path
+                    display_name = entry_path[prefix_len:] if show_path else entry.name
+                    stat = None
+                    if with_stat:
+                        try:
+                            stat = entry.stat(follow_symlinks=False)
+                        except OSError:
+                            pass
+                    add_entry(
+                        (
+                            entry_path,
+                            display_name,
+                            entry.is_dir(follow_symlinks=False),
+                            stat,
+                        )
+                    )
+                    # Больше лимита из одного каталога всё равно не попадёт
+                    if len(entries) > limit:
+                        break
+        except OSError:
+            # Каталог мог исчезнуть или стать недоступным после проверки
             pass
+        return entries
 
-    def generate_tree(self, node: TreeNode, level: int) -> None:
-        if self.full or level == self.args.max_depth:
-            return
-        self.expand(node)
-        for child in node.children:
-            if child.state.is_dir():
-                self.generate_tree(child, level + 1)
+    def __add_entries(self, node: TreeNode, entries: list[_Entry]) -> None:
+        increment_counts = self.__increment_counts
+        add_child = node.children.append
+        stat_cache = self.stat_cache
+        for path, display_name, is_dir, stat in entries:
+            if not increment_counts(is_dir):
+                break
+            add_child(TreeNode(path, [], is_dir, display_name))
+            if stat_cache is not None and stat is not None:
+                stat_cache[path] = stat
 
-    def __should_include(self, child: Path) -> bool:
-        if not self.args.a and child.name.startswith((".", "__")):
-            return False
-        if self.args.d and child.is_file():
+    def __should_include(self, entry: os.DirEntry[str]) -> bool:
+        if not self._include_hidden:
+            name = entry.name
+            first = name[0]
+            # Второй символ проверяется только для имён, начинающихся с "_"
+            if first == "." or (first == "_" and name[1:2] == "_"):
+                return False
+        if self._dirs_only and not entry.is_dir(follow_symlinks=False):
             return False
         return True
 
-    def __increment_counts(self, child: Path) -> None:
-        if child.is_dir():
+    def __increment_counts(self, is_dir: bool) -> bool:
+        # Лимит считается исчерпанным только когда есть лишний элемент
+        if self.full or self.dir_count + self.file_count >= self.limit:
+            self.full = True
+            return False
+        if is_dir:
             self.dir_count += 1
         else:
             self.file_count += 1
-        if self.dir_count + self.file_count >= 200:
-            self.full = True
+        return True
 
-    def __format_tree(self, node: TreeNode, branch: str = "") -> str:
-        result = StringIO()
-        for i, child in enumerate(node.children):
-            item = f"{branch}{'└── ' if i == len(node.children) - 1 else '├── '}"
-            name = (
-                child.state.name
-                if not self.args.f
-                else child.state.relative_to(self.directory)
-            )
-            color = Fore.GREEN if child.state.is_file() else Fore.YELLOW
-            result.write(f"{item}{color}{name}{Style.RESET_ALL}\n")
-            new_branch = f"{branch}{'    ' if i == len(node.children) - 1 else '│   '}"
-            result.write(self.__format_tree(child, new_branch))
-        return result.getvalue()
+    def __format_tree(self, node: TreeNode, parts: list[str]) -> None:
+        stat_cache = self.stat_cache
+        stack = [(child, "", i == 0) for i, child in enumerate(reversed(node.children))]
+        while stack:
+            child, branch, is_last = stack.pop()
+            if is_last:
+                connector, extension = "└── ", "    "
+            else:
+                connector, extension = "├── ", "│   "
+            color = _DIR_PRE if child.is_dir else _FILE_PRE
+            parts.extend((branch, connector, color, child.display_name))
+            if stat_cache is not None and child.state in stat_cache:
+                parts.append(f" [{stat_cache[child.state].st_size}]")
+            parts.append(_LINE_END)
+            if child.children:
+                new_branch = branch + extension
+                stack.extend(
+                    (grandchild, new_branch, i == 0)
+                    for i, grandchild in enumerate(reversed(child.children))
+                )
 
     def __str__(self) -> str:
-        header = f"{Fore.BLUE}{self.root.state.name}{Style.RESET_ALL}\n"
-        body = self.__format_tree(self.root)
-        footer = f"\n{Fore.YELLOW}Directories: {self.dir_count}, "
-        footer += f"{Fore.GREEN}Files: {self.file_count}{Style.RESET_ALL}"
+        parts = [Fore.BLUE, self.root.display_name, _LINE_END]
+        self.__format_tree(self.root, parts)
+        parts.append(f"\n{Fore.YELLOW}Directories: {self.dir_count}, ")
+        parts.append(f"{Fore.GREEN}Files: {self.file_count}{Style.RESET_ALL}")
         if self.full:
-            footer += f"{Fore.RED}\nOutput limited to 200 elements.{Style.RESET_ALL}"
-        return header + body + footer
+            parts.append(f"{Fore.RED}\nOutput limited to {self.limit} elements.")
+            parts.append(Style.RESET_ALL)
+        return "".join(parts)
 
     def save_xml(self, file_path: Path) -> None:
-        def build_xml_element(node: TreeNode) -> ET.Element:
-            is_folder = node.state.is_dir()
-            name = f"{node.state.name}/" if is_folder else node.state.name
-            # Создаём элемент для текущего узла
-            element = ET.Element("node", attrib={"name": name})
-
-            # Рекурсивно добавляем детей
-            for child in node.children:
-                child_element = build_xml_element(child)
-                element.append(child_element)
-
-            return element
-
-        tree = ET.ElementTree(build_xml_element(self.root))
+        # Теги пишутся в файл по мере обхода, без построения дерева элементов;
+        # None в стеке означает закрывающий тег каталога
+        stack: list[tuple[str, TreeNode | None]] = [("", self.root)]
+        with file_path.open("w", encoding="utf-8") as f:
+            f.write("<?xml version='1.0' encoding='utf-8'?>\n")
+            while stack:
+                indent, node = stack.pop()
+                if node is None:
+                    f.write(f"{indent}</node>\n")
+                    continue
+                name = os.path.basename(node.state)
+                if node.is_dir:
+                    name += "/"
+                if not node.children:
+                    f.write(f"{indent}<node name={quoteattr(name)} />\n")
+                    continue
+                f.write(f"{indent}<node name={quoteattr(name)}>\n")
+                stack.append((indent, None))
+                child_indent = indent + "  "
+                stack.extend((child_indent, child) for child in reversed(node.children))
 
-        raw_string = ET.tostring(tree.getroot(), encoding="unicode")
-        parsed = minidom.parseString(raw_string)
-        formated_xml = parsed.toprettyxml(indent="  ")
 
-        with file_path.open("w", encoding="utf-8") as f:
-            f.write(formated_xml)
+def positive_int(value: str) -> int:
+    """
+    Тип аргумента командной строки: целое число не меньше 1.
+    """
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
 
 
 def main(command_line: list[str] | None = None) -> None:
@@ -163,6 +284,25 @@ def main(command_line: list[str] | None = None) -> None:
         help="Tree does not print the indentation lines."
         " Useful when used in conjunction with the -f option.",
     )
+    parser.add_argument(
+        "--limit",
+        type=positive_int,
+        default=200,
+        help="Maximum number of elements to scan.",
+    )
+    parser.add_argument(
+        "-j",
+        "--workers",
+        type=positive_int,
+        default=None,
+        help="Number of directories read in parallel.",
+    )
+    parser.add_argument(
+        "-s",
+        "--long",
+        action="store_true",
+        help="Print the size of each element in bytes.",
+    )
     parser.add_argument("directory", nargs="?", default=".", help="Directory to scan.")
     parser.add_argument(
         "-o",
@@ -173,13 +313,15 @@ def main(command_line: list[str] | None = None) -> None:
     )
     args = parser.parse_args(command_line)
 
+    directory = Path(os.path.normpath(os.path.join(os.getcwd(), args.directory)))
     try:
-        directory = Path(args.directory).resolve(strict=True)
+        os.stat(directory)
     except FileNotFoundError:
-        print(f"Directory '{Path(args.directory).resolve()}' does not exist.")
+        print(f"Directory '{directory}' does not exist.")
         sys.exit(1)
 
-    tree = Tree(directory, args)
+    stat_cache: dict[str, os.stat_result] | None = {} if args.long else None
+    tree = Tree(directory, args, args.limit, args.workers, stat_cache)
     if args.output:
         out_file = Path("XML") / args.output
         tree.save_xml(out_file)
@@ -43,23 +43,25 @@ def test_tree(temp_structure: Path) -> None:
     tree = Tree(temp_structure, args)
 
     assert isinstance(tree.root, TreeNode)
-    assert isinstance(tree.root.state, Path)
+    assert isinstance(tree.root.state, str)
     assert isinstance(tree.root.children, list)
     assert isinstance(tree.root.children[0], TreeNode)
-    assert isinstance(tree.root.children[0].state, Path)
+    assert isinstance(tree.root.children[0].state, str)
 
     assert tree.dir_count == 3
     assert tree.file_count == 3
 
     folder1 = next(
-        child for child in tree.root.children if child.state.name == "folder1"
+        child for child in tree.root.children if child.display_name == "folder1"
     )
     folder2 = next(
-        child for child in tree.root.children if child.state.name == "folder2"
+        child for child in tree.root.children if child.display_name == "folder2"
     )
 
     assert len(folder1) == 2
     assert len(folder2) == 1
+    assert folder1.is_dir
+    assert all(not child.is_dir for child in folder1.children)
 
     args.a = True
     tree = Tree(temp_structure, args)
@@ -74,10 +76,10 @@ def test_tree(temp_structure: Path) -> None:
     assert tree.file_count == 0
 
     folder1 = next(
-        child for child in tree.root.children if child.state.name == "folder1"
+        child for child in tree.root.children if child.display_name == "folder1"
     )
     folder2 = next(
-        child for child in tree.root.children if child.state.name == "folder2"
+        child for child in tree.root.children if child.display_name == "folder2"
     )
 
     assert len(folder1) == 0
@@ -107,16 +109,96 @@ def test_tree(temp_structure: Path) -> None:
     assert "Output limited to 200 elements." in s
 
 
+def test_tree_workers(temp_structure: Path) -> None:
+    args = Namespace(a=False, d=False, f=False, max_depth=None, i=False)
+
+    for workers in (1, 4):
+        tree = Tree(temp_structure, args, workers=workers)
+        assert tree.dir_count == 3
+        assert tree.file_count == 3
+
+    for value in ("0", "-1"):
+        with pytest.raises(SystemExit):
+            main(["-j", value, str(temp_structure)])
+
+
+def test_tree_limit(temp_structure: Path) -> None:
+    args = Namespace(a=False, d=False, f=False, max_depth=None, i=False)
+
+    tree = Tree(temp_structure, args, limit=5)
+    s = str(tree)
+    assert s.count("── ") == 5
+    assert tree.dir_count + tree.file_count == 5
+    assert "Output limited to 5 elements." in s
+
+    tree = Tree(temp_structure, args, limit=1)
+    s = str(tree)
+    assert s.count("── ") == 1
+    assert tree.dir_count + tree.file_count == 1
+    assert "Output limited to 1 elements." in s
+
+    tree = Tree(temp_structure, args, limit=6)
+    s = str(tree)
+    assert s.count("── ") == 6
+    assert not tree.full
+    assert "Output limited" not in s
+
+    with pytest.raises(SystemExit):
+        main(["--limit", "0", str(temp_structure)])
+
+
+def test_tree_limit_deterministic(tmp_path: Path) -> None:
+    for i in range(40):
+        folder = tmp_path / f"d{i}"
+        folder.mkdir()
+        for j in range(15):
+            (folder / f"file{j}.txt").write_text("")
+
+    args = Namespace(a=False, d=False, f=False, max_depth=None, i=False)
+    first = str(Tree(tmp_path, args, limit=100))
+
+    assert "Output limited to 100 elements." in first
+    assert str(Tree(tmp_path, args, limit=100, workers=1)) == first
+    for _ in range(30):
+        assert str(Tree(tmp_path, args, limit=100)) == first
+
+
 def test_tree_node(temp_structure: Path) -> None:
-    node = TreeNode(temp_structure)
-    node.add_child(TreeNode(temp_structure / "folder1"))
-    node.add_child(TreeNode(temp_structure / "folder2"))
+    node = TreeNode(str(temp_structure))
+    node.add_child(TreeNode(str(temp_structure / "folder1")))
+    node.add_child(TreeNode(str(temp_structure / "folder2")))
 
     assert len(node) == 2
     assert node.children == [
-        TreeNode(temp_structure / "folder1"),
-        TreeNode(temp_structure / "folder2"),
+        TreeNode(str(temp_structure / "folder1")),
+        TreeNode(str(temp_structure / "folder2")),
     ]
+    assert node.children[0].display_name == "folder1"
+    assert sorted(reversed(node.children)) == node.children
+
+
+def test_symlinked_directory(temp_structure: Path) -> None:
+    link = temp_structure / "link"
+    try:
+        link.symlink_to(temp_structure / "folder2", target_is_directory=True)
+    except OSError:
+        pytest.skip("Symbolic links are not supported.")
+
+    args = Namespace(a=False, d=False, f=False, max_depth=None, i=False)
+    tree = Tree(temp_structure, args)
+
+    node = next(child for child in tree.root.children if child.display_name == "link")
+    assert not node.is_dir
+    assert len(node) == 0
+    assert tree.dir_count == 3
+    assert tree.file_count == 4
+
+    args.d = True
+    tree = Tree(temp_structure, args)
+
+    assert all(child.display_name != "link" for child in tree.root.children)
+    assert tree.dir_count == 3
+    assert tree.file_count == 0
 
 
 def test_main(capsys: pytest.CaptureFixture[Any], temp_structure: Path) -> None:
@@ -130,6 +212,20 @@ def test_main(capsys: pytest.CaptureFixture[Any], temp_structure: Path) -> None:
 
     assert "folder1\\file1.txt" not in captured.out
     assert ".hidden" in captured.out
+    assert "[11]" not in captured.out
+
+    main(["--long", str(temp_structure)])
+
+    captured = capsys.readouterr()
+
+    assert "file1.txt" in captured.out
+    assert "[11]" in captured.out
+
+    main(["-s", str(temp_structure)])
+
+    captured = capsys.readouterr()
+
+    assert "[11]" in captured.out
 
     args = ["example"]
 